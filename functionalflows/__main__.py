@@ -3,7 +3,7 @@ from rich import print
 
 from typing import Optional
 
-from functionalflows.config import setup
+from functionalflows.config import setup, setup_gridded
 from functionalflows import __app_name__, __version__
 
 
@@ -16,6 +16,18 @@ def run(config_filepath: str = typer.Option(..., '---config', '-c', help='String
     analysis = setup(config_filepath, input_filepath)
     return analysis.run(output_path=output_filepath)
 
+@app.command()
+def run_gridded(config_filepath: str = typer.Option(..., '---config', '-c', help='String path to .toml configuration file containing component definitions.'),
+                input_filepath: str = typer.Option(..., '--inputs', '-i', help='String path to NetCDF file (or .zarr store) containing flows with time and reach dimensions.'),
+                output_filepath: str = typer.Option('', '--outputs', '-o', help='Target string path for NetCDF file (or .zarr store) outputs.'),
+                variable: str = typer.Option('flows', '--variable', help='Name of the flow variable.'),
+                reach_dim: str = typer.Option('reach', '--reach-dim', help='Name of the reach dimension.'),
+                reach_chunks: int = typer.Option(256, '--reach-chunks', help='Number of reaches evaluated in each chunk.'),
+                scheduler: str = typer.Option('threads', '--scheduler', help='Local dask scheduler: threads, processes or synchronous.')):
+    analysis = setup_gridded(config_filepath, input_filepath, variable=variable, reach_dim=reach_dim,
+                             reach_chunks=reach_chunks, scheduler=scheduler)
+    return analysis.run(output_path=output_filepath)
+
 @app.command()
 def main(version: Optional[bool] = typer.Option(None, '--version',  '-v', help='Show application version and exit.', is_eager=True)):
     if version:
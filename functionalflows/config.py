@@ -5,23 +5,36 @@ from typing import List, Dict, Any
 import numpy as np
 
 from functionalflows.model.data import Input
+from functionalflows.model.cache import InputCache
 from functionalflows.model.analysis import Analysis
-from functionalflows.model.characteristic import factory
+from functionalflows.model.gridded import GriddedAnalysis
+from functionalflows.model.characteristic import factory, register, load_closure
 from functionalflows.model.component import Component, ScoringCriteria
 
+def build_characteristics(data: Dict[str, Any]) -> None:
+    '''Registers characteristics in the optional [characteristics] table, i.e.
+    [characteristics.name] function = "package.module:closure", inputs = ["flows"], dtype = "int32", vectorized = true'''
+    for k, v in data.get('characteristics', {}).items():
+        register(k, **{key: value for key, value in v.items() if key != 'function'})(load_closure(v['function']))
+
 def build_components(data: Dict[str, Any]):
+    build_characteristics(data)
     components = []
     for k, v in data['components'].items():
-        components.append(build_component(name=k, data=v))
+        components.append(build_component(name=k, data=v, strict=data.get('strict', False)))
     return components
  
-def build_component(name: str, data: Dict[str, List[Any]]) -> Component:
+def build_component(name: str, data: Dict[str, List[Any]], strict: bool = False) -> Component:
     characteristics = {}
     for i in range(0, len(data['characteristics'])):
-        characteristics[data['characteristics'][i]] = factory(data['characteristics'][i], data['parameters'][i]) 
+        characteristics[data['characteristics'][i]] = factory(data['characteristics'][i], data['parameters'][i], strict) 
     print(f'name: {name}, characteristics: {characteristics}, data: {data["scoring_pattern"]}, success: {data["success_pattern"]}')
     return Component(name, characteristics, ScoringCriteria(data['scoring_pattern'], data['success_pattern']))
 
+def build_cache(data: Dict[str, Any]) -> InputCache|None:
+    '''Builds the input cache from the optional [cache] table (directory, max_bytes, hash_contents).'''
+    return InputCache(**data['cache']) if 'cache' in data else None
+
 def read_config_file(path: str) -> List[Component]:
     with open(path, 'rb') as f:
         data = tomllib.load(f)
@@ -30,4 +43,15 @@ def read_config_file(path: str) -> List[Component]:
 
 def setup(config_filepath: str, input_filepath: str) -> Analysis:
     config_data = read_config_file(config_filepath)
-    return Analysis(Input.from_csv(input_filepath, config_data['first_day_of_water_year']), build_components(config_data))
\ No newline at end of file
+    data = Input.from_csv(input_filepath, config_data['first_day_of_water_year'], build_cache(config_data))
+    if 'resample' in config_data:
+        # optional [resample] table (step, how), i.e., daily mean of sub-daily inputs.
+        data = data.resample(**config_data['resample'])
+    return Analysis(data, build_components(config_data))
+
+def setup_gridded(config_filepath: str, input_filepath: str, **kwargs) -> GriddedAnalysis:
+    '''Sets up an analysis of each reach in a NetCDF (or Zarr) input,
+    kwargs are passed to GriddedAnalysis (i.e., variable, reach_dim, reach_chunks, scheduler).'''
+    config_data = read_config_file(config_filepath)
+    return GriddedAnalysis(input_filepath, build_components(config_data),
+                           config_data['first_day_of_water_year'], **kwargs)
@@ -1,21 +1,29 @@
+from contextlib import nullcontext
 from dataclasses import dataclass
-from typing import List
+from typing import Iterator, List
 
-from functionalflows.model.data import Input
+from functionalflows.model.data import Input, Output
 from functionalflows.model.component import Component
+from functionalflows.model.writer import OutputWriter
 
 @dataclass
 class Analysis:
     data: Input
     components: List[Component]
 
-    def run(self, output_path: str = ''):
-        outputs = []
+    def iter_run(self) -> Iterator[Output]:
+        '''Yields the output of each component as it is evaluated.'''
         for component in self.components:
-            outputs.append(component.evaluate(self.data))
-        if output_path:
-            df = self.data.to_df(reset_index=True)
-            for output in outputs:
-                df = df.join(output.to_df())
-            df.to_csv(output_path)
+            yield component.evaluate(self.data)
+
+    def run(self, output_path: str = '', keep_outputs: bool = True):
+        '''Evaluates the components, streaming their outputs to the output_path (.parquet or csv).
+        If keep_outputs is False the outputs are not held in memory and an empty list is returned.'''
+        outputs = []
+        with OutputWriter(output_path, self.data) if output_path else nullcontext() as writer:
+            for output in self.iter_run():
+                if writer:
+                    writer.write(output)
+                if keep_outputs:
+                    outputs.append(output)
         return outputs
@@ -0,0 +1,132 @@
+'''Defines an on-disk cache of parsed input arrays.
+
+Parsing large input csv files (and computing the day of water year of each date) is repeated
+every time an input is loaded. The cache stores the parsed dates, flows and days of water year
+as binary .npy files, keyed on the input file (path, size, modification time and, optionally,
+a hash of its contents) and the start of the water year, so warm loads are memory maps.
+'''
+import os
+import re
+import shutil
+import hashlib
+import tempfile
+from dataclasses import dataclass, field
+
+import numpy as np
+
+ARRAYS = ('dates', 'flows', 'dsowy')
+'''Names of the cached arrays, each stored as <name>.npy in an entry directory.'''
+
+TIMEZONE = 'timezone.txt'
+'''File storing the timezone of timezone aware dates, which are cached in UTC.'''
+
+ENTRY = re.compile(r'[0-9a-f]{64}')
+'''Entry directory names (keys), the cache never removes anything else in its directory.'''
+
+def default_directory() -> str:
+    '''Cache directory set by the FUNCTIONALFLOWS_CACHE_DIR environment variable,
+    defaults to ~/.cache/functionalflows.'''
+    return os.environ.get('FUNCTIONALFLOWS_CACHE_DIR',
+                          os.path.join(os.path.expanduser('~'), '.cache', 'functionalflows'))
+
+@dataclass
+class InputCache:
+    '''Size bounded, least recently used, on-disk cache of parsed input arrays.'''
+    directory: str = field(default_factory=default_directory)
+    '''Directory in which cache entries are stored.'''
+    max_bytes: int = 2**30
+    '''Maximum total size of the cache, least recently used entries are evicted beyond it.'''
+    hash_contents: bool = False
+    '''If True the key includes a hash of the file contents, otherwise only its size and mtime.'''
+
+    def key(self, path: str, start_of_water_year: int) -> str:
+        '''Computes the cache key for an input file.'''
+        stat = os.stat(path)
+        h = hashlib.sha256(
+            f'{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}|{start_of_water_year}'
+            .encode())
+        if self.hash_contents:
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(2**20), b''):
+                    h.update(block)
+        return h.hexdigest()
+
+    def entries(self) -> list[str]:
+        '''Paths of the cache entry directories.'''
+        if not os.path.isdir(self.directory):
+            return []
+        return [os.path.join(self.directory, name) for name in os.listdir(self.directory)
+                if ENTRY.fullmatch(name) and os.path.isdir(os.path.join(self.directory, name))]
+
+    def load(self, path: str, start_of_water_year: int) -> dict[str, np.ndarray|str|None]|None:
+        '''Memory maps the cached arrays for an input file.
+
+        Returns:
+            dict[str, np.ndarray|str|None]|None: read-only dates (naive, in UTC if the dates
+                have a timezone), flows and dsowy arrays and the timezone (or None),
+                or None if the input file is not cached.
+        '''
+        entry = os.path.join(self.directory, self.key(path, start_of_water_year))
+        if not os.path.isdir(entry):
+            return None
+        try:
+            arrays = {name: np.load(os.path.join(entry, f'{name}.npy'), mmap_mode='r')
+                      for name in ARRAYS}
+            timezone = None
+            if os.path.exists(os.path.join(entry, TIMEZONE)):
+                with open(os.path.join(entry, TIMEZONE), 'r', encoding='utf-8') as f:
+                    timezone = f.read()
+        except (OSError, ValueError):
+            # incomplete or corrupt entry, it is rebuilt by the next store.
+            shutil.rmtree(entry, ignore_errors=True)
+            return None
+        os.utime(entry) # marks entry as recently used.
+        arrays['timezone'] = timezone
+        return arrays
+
+    def store(self, path: str, start_of_water_year: int,
+              dates: np.ndarray, flows: np.ndarray, dsowy: np.ndarray,
+              timezone: str|None = None) -> None:
+        '''Writes the parsed arrays for an input file, then evicts old entries.
+        Timezone aware dates are stored as naive UTC dates and their timezone.
+
+        Raises:
+            OSError: if the entry cannot be written (i.e., the directory is not writable).
+        '''
+        os.makedirs(self.directory, exist_ok=True)
+        entry = os.path.join(self.directory, self.key(path, start_of_water_year))
+        # written to a temporary directory then renamed, so readers never see partial entries.
+        tmp = tempfile.mkdtemp(dir=self.directory, prefix='.tmp')
+        try:
+            for name, array in zip(ARRAYS, (dates, flows, dsowy)):
+                np.save(os.path.join(tmp, f'{name}.npy'), np.asarray(array))
+            if timezone is not None:
+                with open(os.path.join(tmp, TIMEZONE), 'w', encoding='utf-8') as f:
+                    f.write(timezone)
+            if not os.path.isdir(entry):
+                os.replace(tmp, entry)
+        except OSError:
+            # another process may have written the same entry first, it is kept.
+            if not os.path.isdir(entry):
+                raise
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+        self.evict()
+
+    def evict(self) -> None:
+        '''Removes least recently used entries until the cache is within max_bytes.'''
+        entries = []
+        for entry in self.entries():
+            size = sum(f.stat().st_size for f in os.scandir(entry) if f.is_file())
+            entries.append((os.stat(entry).st_mtime, size, entry))
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
+    def clear(self) -> None:
+        '''Removes every cache entry, leaving the directory and any other files in it.'''
+        for entry in self.entries():
+            shutil.rmtree(entry, ignore_errors=True)
@@ -7,6 +7,10 @@ The following characteristics are implemented:
 - frequency
 - rate_of_change
 
+Additional characteristics are registered with the register decorator, by a
+functionalflows.characteristics entry point, or from the [characteristics] table
+of a configuration file.
+
 Following the template in:
 
 Yarnell, S. M., Stein, E. D., Webb, J. A., Grantham, T., Lusardi, R. A., Zimmerman, J.,
@@ -17,7 +21,11 @@ River Research and Applications, 36(2), 318–324.
 https://doi.org/10.1002/rra.3575 
 '''
 
+import inspect
 import operator
+import importlib
+from importlib.metadata import entry_points
+from dataclasses import dataclass
 from typing import Callable, Optional, Any
 
 import numpy as np
@@ -54,37 +62,160 @@ def match_symbol(symbol: str = ">") -> Callable[[Any, Any], bool]:
 
 type EvaluationFx = Callable[[Input, Optional[np.ndarray], Optional[int]], np.ndarray]
 
-def factory(name: str, params: list[Any]) -> EvaluationFx:
+INPUTS = ('flows', 'rolling_mean', 'dsowy', 'water_years', 'outputs')
+'''Arrays a characteristic may declare as inputs: flows, moving average flows (Input.rolling_mean),
+days of water year, water year ids (Input.water_years) and prior characteristic outputs.
+The rolling_mean input requires a window, i.e. 'rolling_mean:7', 'rolling_mean:1D' or
+'rolling_mean:ma_nperiods' (the name of a closure parameter). Declared inputs derived from
+the input are prepared once and shared (i.e., across components and reaches).'''
+
+def parse_input(spec: str) -> tuple[str, str|None]:
+    '''Splits an input declaration into its name and argument (i.e., the rolling mean window).
+
+    Raises:
+        ValueError: if the input is not one of INPUTS or its argument is missing or unexpected.
+    '''
+    name, _, arg = spec.partition(':')
+    if name not in INPUTS:
+        raise ValueError(f'The characteristic input {name} is not one of {INPUTS}.')
+    if (name == 'rolling_mean') != bool(arg):
+        raise ValueError(f'The characteristic input {spec} is invalid, '
+                         'only rolling_mean takes a window, i.e. rolling_mean:7.')
+    return name, arg or None
+
+@dataclass
+class Evaluation:
+    '''
+    Characteristic evaluation function with its array contract resolved for its parameters.
+    '''
+    evaluate: EvaluationFx
+    inputs: tuple[tuple[str, Any], ...] = ()
+    '''Declared (name, argument) inputs, i.e. ('rolling_mean', 7), prepared before evaluation.'''
+    dtype: str = 'int32'
+    vectorized: bool = False
+
+    def __call__(self, data: Input, *args) -> np.ndarray:
+        return self.evaluate(data, *args)
+
+ENTRY_POINT_GROUP = 'functionalflows.characteristics'
+'''Entry point group searched for characteristics that are not registered.'''
+
+@dataclass
+class Characteristic:
+    '''
+    Registered characteristic, with the closure creating its evaluation function and its array contract.
+    '''
+    name: str
+    closure: Callable[..., EvaluationFx]
+    '''Closure returning the evaluation function, called with the configured parameters.'''
+    inputs: tuple[str, ...] = ('flows',)
+    '''Arrays used by the evaluation function, see INPUTS.'''
+    dtype: str = 'int32'
+    '''Integer (or bool) dtype of the evaluation function output.'''
+    vectorized: bool = False
+    '''True if the evaluation function is implemented with array operations (no python loops).'''
+
+    def __post_init__(self) -> None:
+        for spec in self.inputs:
+            parse_input(spec)
+        if not (np.issubdtype(np.dtype(self.dtype), np.integer) or np.dtype(self.dtype) == np.bool_):
+            raise ValueError(f'The {self.name} characteristic dtype {self.dtype} is not an integer type.')
+
+    def bind(self, params: list[Any]) -> Evaluation:
+        '''Creates the evaluation function, resolving inputs that name a closure parameter.'''
+        try:
+            arguments = inspect.signature(self.closure).bind(*params)
+            arguments.apply_defaults()
+            arguments = arguments.arguments
+        except (TypeError, ValueError):
+            arguments = {}
+        inputs = []
+        for spec in self.inputs:
+            name, arg = parse_input(spec)
+            if arg in arguments:
+                arg = arguments[arg]
+            elif arg is not None and arg.isdigit():
+                arg = int(arg)
+            inputs.append((name, arg))
+        return Evaluation(self.closure(*params), tuple(inputs), self.dtype, self.vectorized)
+
+REGISTRY: dict[str, Characteristic] = {}
+'''Registered characteristics by name.'''
+
+def register(name: str|None = None, inputs: tuple[str, ...] = ('flows',),
+             dtype: str = 'int32', vectorized: bool = False) -> Callable:
+    '''Decorator registering a characteristic closure.
+
+    Args:
+        name (str|None): characteristic name. Defaults to None, the closure name.
+        inputs (tuple[str, ...]): arrays used by the evaluation function, see INPUTS
+            (i.e., 'rolling_mean:7'). Defaults to ('flows',).
+        dtype (str): integer dtype of the evaluation function output. Defaults to 'int32'.
+        vectorized (bool): True if the evaluation function uses array operations. Defaults to False.
+
+    Returns:
+        Callable: decorator returning the closure unchanged.
+    '''
+    def decorator(closure: Callable[..., EvaluationFx]) -> Callable[..., EvaluationFx]:
+        key = closure.__name__ if name is None else name
+        REGISTRY[key] = Characteristic(key, closure, tuple(inputs), dtype, vectorized)
+        return closure
+    return decorator
+
+def load_closure(path: str) -> Callable[..., EvaluationFx]:
+    '''Imports a closure from a 'package.module:function' path.'''
+    module, _, attribute = path.partition(':')
+    return getattr(importlib.import_module(module), attribute)
+
+def lookup(name: str) -> Characteristic:
+    '''Finds a registered characteristic, loading it from an entry point if it is not registered.
+
+    Raises:
+        NotImplementedError: if the characteristic is not implemented.
+    '''
+    if name not in REGISTRY:
+        for entry_point in entry_points(group=ENTRY_POINT_GROUP, name=name):
+            closure = entry_point.load()
+            if name not in REGISTRY:
+                # undecorated closures are registered with the default contract.
+                register(name)(closure)
+    if name not in REGISTRY:
+        raise NotImplementedError(
+            f'''The {name} characteristic is not implemented,
+            in the characteristic registry.''')
+    return REGISTRY[name]
+
+def factory(name: str, params: list[Any], strict: bool = False) -> Evaluation:
     '''Factory method for creating characteristic functions.
 
     Args:
-        name (str): implemented characteristics...
+        name (str): registered characteristics, i.e.
             [timing, magnitude, duration, rate_of_change, frequency]
         params (list[Any]): required parameters for the characteristic function.
             i.e. [start, end] for timing, [ma_nperiods, threshold, symbol] for magnitude, etc.
+        strict (bool): if True, characteristics that are not vectorized are rejected.
+            Defaults to False.
 
     Raises:
         NotImplementedError: if the characteristic is not implemented.
+        ValueError: if strict and the characteristic is not vectorized.
 
     Returns:
-        EvaluationFx: Charactersitic evaluation function.
+        Evaluation: Charactersitic evaluation function, with its array contract.
     '''
-    match name:
-        case 'timing':
-            return timing(params[0], params[1])
-        case 'magnitude':
-            return magnitude(params[0], params[1], params[2])
-        case 'duration':
-            return duration(params[0], params[1], params[2])
-        case 'rate_of_change':
-            return rate_of_change(params[0], params[1], params[2])
-        case 'frequency':
-            return frequency(params[0], params[1], params[2], params[3])
-        case _:
-            raise NotImplementedError(
-                f'''The {name} characteristic is not implemented,
-                in the characteristic factory method.''')
+    characteristic = lookup(name)
+    if strict and not characteristic.vectorized:
+        raise ValueError(f'The {name} characteristic is not vectorized, it is rejected in strict mode.')
+    return characteristic.bind(params)
+
+def matches(outputs: np.ndarray, order: int, row_pattern) -> np.ndarray:
+    '''Boolean array, True for rows in which the first order-1 outputs match the row pattern.'''
+    pattern = np.asarray(row_pattern)
+    if pattern.shape != (order-1,):
+        return np.zeros(outputs.shape[0], dtype=bool)
+    return np.all(outputs[:, :order-1] == pattern, axis=1)
 
+@register(inputs=('dsowy',), vectorized=True)
 def timing(start: int = 0, end: int = 367) -> EvaluationFx:
     '''Closure for evaluating timing characteristics.
 
@@ -98,17 +229,16 @@ def timing(start: int = 0, end: int = 367) -> EvaluationFx:
     # pylint: disable=unused-argument
     def evaluate(data: Input,
                  outputs: np.ndarray|None = None, order: int|None = None) -> np.ndarray:
-        @np.vectorize
-        def f(day: int) -> int:
-            return 1 if start <= day < end else 0
-        return f(data.dsowy)
+        return ((start <= data.dsowy) & (data.dsowy < end)).astype(np.int32)
     return evaluate
 
-def magnitude(ma_nperiods: int = 1, threshold: float = 0, symbol: str = '>') -> EvaluationFx:
+@register(inputs=('rolling_mean:ma_nperiods',), vectorized=True)
+def magnitude(ma_nperiods: int|str = 1, threshold: float = 0, symbol: str = '>') -> EvaluationFx:
     '''Closure for evaluating magnitude characteristics.
 
     Args:
-        ma_nperiods (int): Periods over which to average (moving average) flow. Defaults to 1.
+        ma_nperiods (int|str): Periods over which to average (moving average) flow,
+            or a duration (i.e., '1D') converted to periods at the input timestep. Defaults to 1.
         threshold (float): Magnitude threshold. Defaults to 0.
         symbol (str): Magnitude comparision operator(i.e., <, <=, ...). Defaults to '>'.
 
@@ -119,20 +249,17 @@ def magnitude(ma_nperiods: int = 1, threshold: float = 0, symbol: str = '>') ->
     # pylint: disable=unused-argument
     def evaluate(data: Input,
                  outputs: np.ndarray|None = None, order: int|None = None) -> np.ndarray:
-        flows = (data.flows if ma_nperiods == 1
-                 else pd.Series(data.flows).rolling(ma_nperiods, min_periods=1).mean().to_numpy())
-        @np.vectorize
-        def f(flow: float) -> np.int32:
-            return 1 if _operator(flow, threshold) else 0
-        return f(flows)
+        return _operator(data.rolling_mean(ma_nperiods), threshold).astype(np.int32)
     return evaluate
 
-def duration(nperiods: int = 1,
+@register(inputs=('outputs',), vectorized=True)
+def duration(nperiods: int|str = 1,
              row_pattern: np.ndarray|None = None, symbol: str = ">") -> EvaluationFx:
     '''Closure for evaluating duration characteristics.
 
     Args:
-        nperiods (int): Periods of which pattern duration is evaluated. Defaults to 1.
+        nperiods (int|str): Periods of which pattern duration is evaluated,
+            or a duration (i.e., '7D') converted to periods at the input timestep. Defaults to 1.
         row_pattern (Optional[np.ndarray]): Timestep pattern to search. Defaults to None.
         symbol (str): Duration comparison operator (i.e., <, <=, ...). Defaults to ">".
 
@@ -141,28 +268,33 @@ def duration(nperiods: int = 1,
     '''
     _operator = match_symbol(symbol)
     def evaluate(data: Input, outputs: np.ndarray, order: int = 3) -> np.ndarray:
-        n, rows = 0, len(data.flows)
-        out = np.zeros(rows, dtype=np.int32)
+        rows = len(data.flows)
         pattern = np.ones(order-1, dtype=np.int32) if row_pattern is None else row_pattern
-        for i in range(0, len(out)):
-            if np.array_equal(outputs[i,:order-1], pattern):
-                n+=1
-            else:
-                # IF pattern has met comparision (<, >, ...), duration condition.
-                if _operator(n, nperiods):
-                    out[i-n:i] = 1  # Marks entire period over which duration condition is met.
-                n = 0
-        return out
+        # starts and (exclusive) ends of each run of rows matching the pattern.
+        edges = np.diff(np.concatenate(([0], matches(outputs, order, pattern), [0])).astype(np.int8))
+        starts, ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+        # runs meeting the comparison (<, >, ...) duration condition are marked,
+        # except a run continuing through the last row.
+        keep = _operator(ends - starts, data.periods(nperiods, minimum=0)) & (ends < rows)
+        marks = np.zeros(rows+1, dtype=np.int32)
+        marks[starts[keep]] += 1
+        marks[ends[keep]] -= 1
+        return np.cumsum(marks[:-1], dtype=np.int32)
     return evaluate
 
-def rate_of_change(ma_nperiods: int = 1,
-                   threshold_factor: float = 2, symbol: str = '>') -> EvaluationFx:
+@register(inputs=('rolling_mean:ma_nperiods',), vectorized=True)
+def rate_of_change(ma_nperiods: int|str = 1,
+                   threshold_factor: float = 2, symbol: str = '>',
+                   interval: int|str = 1) -> EvaluationFx:
     '''Closure for evaluating rate of change characteristics.
 
     Args:
-        ma_nperiods (int): Periods over which to average (moving average) flow. Defaults to 1.
+        ma_nperiods (int|str): Periods over which to average (moving average) flow,
+            or a duration (i.e., '1D') converted to periods at the input timestep. Defaults to 1.
         threshold_factor (float): Flow delta threshold as portion of previous flow. Defaults to 2.
         symbol (str): Rate of change comparison operator. Defaults to '>'.
+        interval (int|str): Periods between the compared flows, or a duration (i.e., '1D')
+            converted to periods at the input timestep. Defaults to 1 (consecutive periods).
 
     Returns:
         EvaluationFx: Rate of change characteristic evaluation function.
@@ -171,20 +303,19 @@ def rate_of_change(ma_nperiods: int = 1,
     # pylint: disable=unused-argument
     def evaluate(data: Input,
                  outputs: np.ndarray|None = None, order: int|None = None) -> np.ndarray:
-        flows = (data.flows if ma_nperiods == 1
-                 else pd.Series(data.flows).rolling(ma_nperiods, min_periods=1).mean().to_numpy())
+        flows, lag = data.rolling_mean(ma_nperiods), data.periods(interval)
         out = np.zeros(len(data.flows), dtype=np.int32)
-        for i in range(1, len(out)):
-            if flows[i-1] == 0:
-                # so there is no divide by zero error
-                change = 0 if flows[i] == 0 else 1
-            else:
-                # min function prevents tiny previous day values from evaluating toward infinity.
-                change = min((flows[i] - flows[i-1]) / flows[i-1], 100)
-            out[i] = 1 if _operator(change, threshold_factor) else 0
+        previous, current = flows[:-lag], flows[lag:]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # min function prevents tiny previous day values from evaluating toward infinity.
+            change = np.minimum((current - previous) / previous, 100)
+        # so there is no divide by zero error
+        change = np.where(previous == 0, np.where(current == 0, 0, 1), change)
+        out[lag:] = _operator(change, threshold_factor)
         return out
     return evaluate
 
+@register(inputs=('outputs', 'water_years'), vectorized=True)
 def frequency(n_times: int, n_years: int,
               row_pattern: np.ndarray, symbol: str = '>') -> EvaluationFx:
     '''Closure for evaluating frequency characteristics.
@@ -200,23 +331,13 @@ def frequency(n_times: int, n_years: int,
     '''
     _operator = match_symbol(symbol)
     def evaluate(data: Input, outputs: np.ndarray, order = 2) -> np.ndarray:
-        # pylint: disable=invalid-name
-        T, n, yrs = len(data.flows), 0, []
-        # count number of occurances each year
-        for i in range(0, T):
-            if data.dsowy[i] == 1 or i == T-1:
-                yrs.append(n)
-                n = 0
-            if np.array_equal(outputs[i,:order-1], row_pattern):
-                n += 1
+        years = data.water_years
+        # count number of occurances each year (the last row is not counted).
+        matched = matches(outputs, order, row_pattern)[:-1]
+        yrs = np.bincount(years[:-1][matched], minlength=years[-1]+1)
         # count rolling sum of ntimes per nyear period, if n_times < ntimes then 1 o/w 0.
         out_yrs = np.where(pd.Series(
-            np.array(yrs, dtype=np.int32)).rolling(n_years, min_periods=1).sum() < n_times, 0, 1)
+            yrs.astype(np.int32)).rolling(n_years, min_periods=1).sum() < n_times, 0, 1)
         # if criteria was met for year then fill in ones for each day in year, otherwise 0.
-        t, out = 0, np.zeros(len(data.flows), dtype=np.int32)
-        for i, _ in enumerate(out):
-            if data.dsowy[i] == 1:
-                t += 1
-            out[i] = out_yrs[t]
-        return out
+        return out_yrs[years].astype(np.int32)
     return evaluate
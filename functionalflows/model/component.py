@@ -64,12 +64,26 @@ class Component:
     characteristics: dict[str, EvaluationFx] # order of key, item pairs is preserved in python 3.7+
     scoring_criteria: ScoringCriteria
 
+    def output_names(self) -> list[str]:
+        '''Names of the output columns: each characteristic followed by the score.'''
+        return list(self.characteristics.keys()) + [self.scoring_criteria.name()]
+
+    def inputs(self) -> list[tuple[str, Any]]:
+        '''Inputs declared by the characteristics, plain evaluation functions declare none.'''
+        return [i for v in self.characteristics.values() for i in getattr(v, 'inputs', ())]
+
+    def dtype(self) -> np.dtype:
+        '''Output dtype, wide enough for the dtype declared by each characteristic.'''
+        return np.result_type(np.int32, *[getattr(v, 'dtype', np.int32)
+                                          for v in self.characteristics.values()])
+
     def evaluate(self, data: Input) -> Output:
         i = 0
         rows, columns =len(data.flows), len(self.characteristics)+1
-        outputs = np.zeros(shape=(rows, columns), dtype=np.int32)       
+        data.prepare(self.inputs())
+        # column major, so each characteristic column is contiguous.
+        outputs = np.zeros(shape=(rows, columns), dtype=self.dtype(), order='F')
         for _, v in self.characteristics.items():
             outputs[:, i] = v(data, outputs)
             i += 1
-        output_names = list(self.characteristics.keys()) + [self.scoring_criteria.name()]
-        return Output(component_name=self.name, characteristic_names=output_names, data=self.scoring_criteria.score(outputs))
+        return Output(component_name=self.name, characteristic_names=self.output_names(), data=self.scoring_criteria.score(outputs))
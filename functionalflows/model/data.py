@@ -1,47 +1,213 @@
-from functools import partial
+import copy
+from functools import cached_property
 from dataclasses import dataclass, field
 
 import numpy as np
 import pandas as pd
 
-from functionalflows.utilities import day_of_water_year
+from functionalflows.utilities import days_of_water_year
+from functionalflows.model.cache import InputCache
 
 @dataclass
 class Input:
     dates: pd.Series
     flows: np.ndarray
     start_of_water_year: int = 274
-    dsowy: np.ndarray = field(init=False)
+    dsowy: np.ndarray = field(default=None)
+    '''Computed from the dates unless provided (i.e., by the input cache).'''
+    _rolling_means: dict[int, np.ndarray] = field(default_factory=dict, init=False, repr=False)
 
     def __post_init__(self):
-        self.dsowy = self.dates.apply(partial(day_of_water_year,
-                                              start=self.start_of_water_year)).to_numpy()
+        if self.dsowy is None:
+            self.dsowy = days_of_water_year(self.dates, self.start_of_water_year)
 
     @classmethod
     def from_df(cls, df: pd.DataFrame, start_of_water_year: int = 274):
         return cls(pd.to_datetime(df['dates']), df['flows'].to_numpy(), start_of_water_year)
 
     @classmethod
-    def from_csv(cls, path: str, start_of_water_year: int = 274):
-        return cls.from_df(pd.read_csv(path), start_of_water_year)
+    def from_csv(cls, path: str, start_of_water_year: int = 274, cache: InputCache|None = None):
+        '''Reads an input csv file, with dates and flows columns.
+
+        If a cache is provided the parsed arrays are memory mapped from it when the file
+        is unchanged, otherwise the file is parsed and the arrays are added to the cache.
+        '''
+        if cache is None:
+            return cls.from_df(pd.read_csv(path), start_of_water_year)
+        arrays = cache.load(path, start_of_water_year)
+        if arrays is not None:
+            dates = pd.Series(arrays['dates'], name='dates')
+            if arrays['timezone'] is not None:
+                dates = dates.dt.tz_localize('UTC').dt.tz_convert(arrays['timezone'])
+            return cls(dates, arrays['flows'], start_of_water_year, arrays['dsowy'])
+        data = cls.from_df(pd.read_csv(path), start_of_water_year)
+        # dates that are not parsed to a single datetime dtype (i.e., mixed offsets) are not cached.
+        if pd.api.types.is_datetime64_any_dtype(data.dates):
+            timezone = data.dates.dt.tz
+            dates = data.dates if timezone is None else data.dates.dt.tz_convert('UTC').dt.tz_localize(None)
+            try:
+                cache.store(path, start_of_water_year, dates.to_numpy(), data.flows, data.dsowy,
+                            None if timezone is None else str(timezone))
+            except OSError:
+                # the cache is best effort, the parsed input is returned regardless.
+                pass
+        return data
+
+    @classmethod
+    def from_dataarray(cls, da, time_dim: str = 'time', start_of_water_year: int = 274):
+        '''Builds an Input from a one dimensional (time) xarray.DataArray of flows.'''
+        return cls(pd.Series(pd.to_datetime(da[time_dim].to_numpy())),
+                   da.to_numpy(), start_of_water_year)
+
+    @classmethod
+    def from_netcdf(cls, path: str, reach: int = 0, variable: str = 'flows',
+                    time_dim: str = 'time', reach_dim: str = 'reach',
+                    start_of_water_year: int = 274):
+        '''Reads the flows at a single reach (by position) from a NetCDF file.
+
+        Only the selected reach is loaded. Use GriddedAnalysis to evaluate every reach.
+        Requires the optional xarray dependency.
+        '''
+        import xarray as xr # pylint: disable=import-outside-toplevel
+        with xr.open_dataset(path) as ds:
+            da = ds[variable]
+            if reach_dim in da.dims:
+                da = da.isel({reach_dim: reach})
+            return cls.from_dataarray(da.load(), time_dim, start_of_water_year)
 
     def to_df(self, reset_index=False):
         df = pd.DataFrame(data=self.flows, index=self.dates, columns=['flows'])
         df['day_of_water_year'] = self.dsowy
         return df.reset_index() if reset_index else df
 
+    @cached_property
+    def timestep(self) -> pd.Timedelta:
+        '''Typical (median) time between rows, 1 day if there are fewer than 2 rows.'''
+        if len(self.dates) < 2:
+            return pd.Timedelta(days=1)
+        return pd.Timedelta(int(np.median(np.diff(
+            self.dates.to_numpy(dtype='datetime64[ns]').view(np.int64)))), unit='ns')
+
+    def periods(self, window: int|str, minimum: int = 1) -> int:
+        '''Converts a window to a number of rows (periods).
+
+        Args:
+            window (int|str): number of periods, or a duration (i.e., '1D', '6h')
+                converted to periods at the input timestep.
+            minimum (int): smallest valid number of periods, i.e. 1 for windows and lags,
+                0 for duration thresholds. Defaults to 1.
+
+        Raises:
+            ValueError: if the number of periods is less than minimum.
+
+        Returns:
+            int: number of periods, durations shorter than the timestep are minimum periods.
+        '''
+        if isinstance(window, str):
+            return max(minimum, round(pd.Timedelta(window) / self.timestep))
+        if window < minimum:
+            raise ValueError(f'The number of periods {window} must be at least {minimum}.')
+        return window
+
+    def with_flows(self, flows: np.ndarray,
+                   rolling_means: dict[int, np.ndarray]|None = None) -> 'Input':
+        '''Copy with new flows, sharing the dates and arrays derived from them (i.e., dsowy).
+        Moving averages of the new flows computed elsewhere (i.e., for many reaches at once)
+        can be provided by number of periods.'''
+        data = copy.copy(self)
+        data.flows = flows
+        data._rolling_means = {} if rolling_means is None else dict(rolling_means) # pylint: disable=protected-access
+        return data
+
+    def prepare(self, inputs) -> None:
+        '''Computes the declared (name, argument) characteristic inputs that are derived
+        from the flows or dates, i.e. ('rolling_mean', 7) or ('water_years', None),
+        so they are computed once and shared by the characteristics using them.'''
+        for name, arg in inputs:
+            match name:
+                case 'rolling_mean':
+                    self.rolling_mean(arg)
+                case 'water_years':
+                    _ = self.water_years
+
+    def rolling_mean(self, nperiods: int|str = 1) -> np.ndarray:
+        '''Moving average of flows over nperiods (or a duration, i.e., '1D'),
+        computed once and shared by every characteristic using it.'''
+        n = self.periods(nperiods)
+        if n == 1:
+            return self.flows
+        if n not in self._rolling_means:
+            self._rolling_means[n] = pd.Series(self.flows).rolling(n, min_periods=1).mean().to_numpy()
+        return self._rolling_means[n]
+
+    @cached_property
+    def water_years(self) -> np.ndarray:
+        '''Water year ids, incremented at the first period of each water year
+        (0 for periods before the first water year begins).'''
+        new_year = (self.dsowy == 1) & (np.concatenate(([0], self.dsowy[:-1])) != 1)
+        return np.cumsum(new_year)
+
+    def resample(self, step: str = '1D', how: str = 'mean') -> 'Input':
+        '''Aggregates (i.e., sub-daily) flows to the evaluation timestep.
+
+        Args:
+            step (str): evaluation timestep, as a pandas timedelta string. Defaults to '1D'.
+            how (str): aggregation method [mean, max, min]. Defaults to 'mean'.
+
+        Raises:
+            ValueError: if the dates are not in ascending order.
+            NotImplementedError: if the aggregation method is not recognized.
+
+        Returns:
+            Input: with one row per step, dated at the start of the step.
+        '''
+        if not self.dates.is_monotonic_increasing:
+            raise ValueError('The dates must be in ascending order to be resampled.')
+        ns = pd.Timedelta(step).value
+        # timezone aware dates are binned by local (wall clock) time, i.e. by local day.
+        timezone = self.dates.dt.tz
+        local = self.dates if timezone is None else self.dates.dt.tz_localize(None)
+        bins = local.to_numpy(dtype='datetime64[ns]').view(np.int64) // ns
+        # first row of each bin, bins are contiguous since dates are sorted.
+        starts = np.flatnonzero(np.concatenate(([True], bins[1:] != bins[:-1])))
+        flows = np.asarray(self.flows, dtype=np.float64)
+        match how:
+            case 'mean':
+                values = np.add.reduceat(flows, starts) / np.diff(np.append(starts, len(flows)))
+            case 'max':
+                values = np.maximum.reduceat(flows, starts)
+            case 'min':
+                values = np.minimum.reduceat(flows, starts)
+            case _:
+                raise NotImplementedError(f'The resampling method {how} is not recognized.')
+        dates = pd.Series((bins[starts] * ns).astype('datetime64[ns]'), name='dates')
+        if timezone is not None:
+            # ambiguous bin starts (i.e., when clocks are set back) are the first occurrence.
+            dates = dates.dt.tz_localize(timezone, ambiguous=np.ones(len(dates), dtype=bool),
+                                         nonexistent='shift_forward')
+        return Input(dates, values, self.start_of_water_year)
+
 @dataclass
 class Output:
     component_name: str
     characteristic_names: list[str]
     data: np.ndarray
+    '''Output columns, in column major (Fortran) order so each column is contiguous.'''
+
+    def column_names(self) -> list[str]:
+        return [f'{self.component_name}_{name}' for name in self.characteristic_names]
 
     def to_df(self):
-        output = {}
-        for i in range(0, len(self.characteristic_names)):
-            output[f'{self.component_name}_{self.characteristic_names[i]}'] = self.data[:, i]
-        #output[self.component_name] = self.data[:,i] #self.vulnerability()
-        return pd.DataFrame.from_dict(output)
+        # a single 2d block, a view of data (no copy) when data is in column major order.
+        return pd.DataFrame(self.data, columns=self.column_names(), copy=False)
+
+    def to_arrow(self):
+        '''Arrow record batch with a zero copy view of each (contiguous) data column.
+        Requires the optional pyarrow dependency.'''
+        import pyarrow as pa # pylint: disable=import-outside-toplevel
+        return pa.RecordBatch.from_arrays(
+            [pa.array(self.data[:, i]) for i in range(self.data.shape[1])],
+            names=self.column_names())
 
     # def vulnerability(self):
     #     output = np.ones(len(self.data), dtype=np.int32)
@@ -0,0 +1,125 @@
+'''Evaluates functional flow components over gridded flows (i.e., a river network of reaches).
+
+Flows are opened lazily from a NetCDF file or Zarr store with xarray and chunked along the
+reach dimension. Each chunk is evaluated independently, reach by reach, by a local dask
+scheduler and the outputs are written back to disk chunk by chunk, so the full grid is
+never held in memory. Requires the optional xarray and dask dependencies
+(i.e., pip install functionalflows[gridded]).
+'''
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from functionalflows.model.data import Input
+from functionalflows.model.component import Component
+
+try:
+    import dask
+    import xarray as xr
+except ImportError:
+    dask, xr = None, None
+
+def _require_xarray() -> None:
+    if xr is None or dask is None:
+        raise ImportError(
+            'Gridded analysis requires xarray and dask, '
+            'install them with: pip install functionalflows[gridded]')
+
+def block_dtype(components: List[Component]) -> np.dtype:
+    '''Output dtype, wide enough for the outputs of every component.'''
+    return np.result_type(*[component.dtype() for component in components])
+
+def evaluate_block(flows: np.ndarray, template: Input, components: List[Component]) -> np.ndarray:
+    '''Evaluates components at every reach in a block of flows.
+
+    Args:
+        flows (np.ndarray): flows with shape (time, reaches).
+        template (Input): input with the shared dates and days of water year.
+        components (List[Component]): components to evaluate.
+
+    Returns:
+        np.ndarray: outputs with shape (time, reaches, columns), where the columns are the
+            output columns of each component in order.
+    '''
+    columns = sum(len(component.output_names()) for component in components)
+    out = np.zeros(shape=(flows.shape[0], flows.shape[1], columns), dtype=block_dtype(components))
+    inputs = [i for component in components for i in component.inputs()]
+    # arrays derived from the dates are shared by all reaches, so they are computed once.
+    template.prepare([(name, arg) for name, arg in inputs if name != 'rolling_mean'])
+    # declared moving averages are computed for every reach in the block at once.
+    windows = {template.periods(arg) for name, arg in inputs if name == 'rolling_mean'} - {1}
+    means = {n: np.asfortranarray(pd.DataFrame(flows).rolling(n, min_periods=1).mean().to_numpy())
+             for n in windows}
+    for j in range(flows.shape[1]):
+        data = template.with_flows(flows[:, j], {n: mean[:, j] for n, mean in means.items()})
+        k = 0
+        for component in components:
+            output = component.evaluate(data)
+            out[:, j, k:k+output.data.shape[1]] = output.data
+            k += output.data.shape[1]
+    return out
+
+@dataclass
+class GriddedAnalysis:
+    '''Analysis of functional flow components at each reach of a gridded flow dataset.'''
+    path: str
+    '''Path to the NetCDF file (or .zarr store) containing the flows.'''
+    components: List[Component]
+    start_of_water_year: int = 274
+    variable: str = 'flows'
+    '''Name of the flow variable, with time and reach dimensions.'''
+    time_dim: str = 'time'
+    reach_dim: str = 'reach'
+    reach_chunks: int = 256
+    '''Number of reaches evaluated together in each chunk.'''
+    scheduler: str = 'threads'
+    '''Local dask scheduler: threads, processes or synchronous.'''
+
+    def open_dataset(self) -> 'xr.Dataset':
+        '''Lazily opens the flows, in a single chunk along time and reach_chunks along reach.'''
+        _require_xarray()
+        chunks = {self.time_dim: -1, self.reach_dim: self.reach_chunks}
+        if self.path.rstrip('/').endswith('.zarr'):
+            return xr.open_zarr(self.path, chunks=chunks)
+        return xr.open_dataset(self.path, chunks=chunks)
+
+    def evaluate(self, ds: 'xr.Dataset|None' = None) -> 'xr.Dataset':
+        '''Builds the (lazy) output dataset, with one variable per component output column.'''
+        ds = self.open_dataset() if ds is None else ds
+        flows = ds[self.variable].transpose(self.time_dim, self.reach_dim)
+        # characteristics are sequential in time, so time must be a single chunk.
+        flows = flows.chunk({self.time_dim: -1}).data
+        template = Input(pd.Series(pd.to_datetime(ds[self.time_dim].to_numpy())),
+                         np.zeros(flows.shape[0]), self.start_of_water_year)
+        names = [f'{component.name}_{name}'
+                 for component in self.components for name in component.output_names()]
+        outputs = flows.map_blocks(evaluate_block, template, self.components,
+                                   dtype=block_dtype(self.components), new_axis=2,
+                                   chunks=(flows.chunks[0], flows.chunks[1], (len(names),)))
+        coords = {dim: ds[dim] for dim in (self.time_dim, self.reach_dim) if dim in ds.coords}
+        return xr.Dataset(
+            data_vars={name: ((self.time_dim, self.reach_dim), outputs[:, :, k])
+                       for k, name in enumerate(names)},
+            coords=coords)
+
+    def run(self, output_path: str = '') -> 'xr.Dataset':
+        '''Evaluates the components and writes the outputs chunk by chunk.
+
+        Args:
+            output_path (str): target NetCDF file, or Zarr store if it ends with .zarr.
+                Writing NetCDF with the processes scheduler is not supported by all backends,
+                prefer a Zarr store in that case. Defaults to '', nothing is written.
+
+        Returns:
+            xr.Dataset: the lazy output dataset.
+        '''
+        outputs = self.evaluate()
+        if output_path:
+            with dask.config.set(scheduler=self.scheduler):
+                if output_path.rstrip('/').endswith('.zarr'):
+                    outputs.to_zarr(output_path, mode='w')
+                else:
+                    outputs.to_netcdf(output_path)
+        return outputs
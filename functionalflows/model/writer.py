@@ -0,0 +1,100 @@
+'''Defines a streaming writer for analysis outputs.
+
+Component outputs are appended to the writer as each component is evaluated. Their columns are
+spooled to disk (as column major .npy files), so completed outputs need not be held in memory,
+and the output file is assembled from memory mapped columns when the writer is closed:
+in chunks of rows for csv files, or as a zero copy Arrow table for .parquet files.
+'''
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from functionalflows.model.data import Input, Output
+
+class OutputWriter:
+    '''Streams the input and component output columns of an analysis to a .parquet or csv file.
+
+    Usage:
+        with OutputWriter(path, data) as writer:
+            for output in analysis.iter_run():
+                writer.write(output)
+    '''
+    def __init__(self, path: str, data: Input, chunk_rows: int = 2**16,
+                 spool_directory: str|None = None):
+        '''
+        Args:
+            path (str): target .parquet (requires pyarrow) output file,
+                csv is written for any other extension.
+            data (Input): analysis input, written in the first columns.
+            chunk_rows (int): rows written at a time to csv files. Defaults to 65536.
+            spool_directory (str|None): directory in which the columns are spooled.
+                Defaults to None, the directory of the output file (rather than the system
+                temporary directory, which may be held in memory).
+        '''
+        self.path = path
+        self.data = data
+        self.chunk_rows = chunk_rows
+        self.names: list[list[str]] = []
+        spool_directory = (os.path.dirname(os.path.abspath(path))
+                           if spool_directory is None else spool_directory)
+        self._spool = tempfile.TemporaryDirectory(prefix='.functionalflows', dir=spool_directory) # pylint: disable=consider-using-with
+
+    def __enter__(self) -> 'OutputWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self._spool.cleanup()
+
+    def write(self, output: Output) -> None:
+        '''Appends the columns of a component output.
+
+        Raises:
+            ValueError: if a column name has already been written (i.e., by a component
+                with the same name).
+        '''
+        written = {'dates', 'flows', 'day_of_water_year'}.union(*self.names)
+        overlap = [name for name in output.column_names() if name in written]
+        if overlap:
+            raise ValueError(f'The output columns {overlap} overlap columns already written.')
+        np.save(os.path.join(self._spool.name, f'{len(self.names)}.npy'),
+                np.asfortranarray(output.data))
+        self.names.append(output.column_names())
+
+    def close(self) -> None:
+        '''Writes the output file from the spooled columns.'''
+        try:
+            outputs = [np.load(os.path.join(self._spool.name, f'{i}.npy'), mmap_mode='r')
+                       for i in range(len(self.names))]
+            if self.path.endswith('.parquet'):
+                self._write_parquet(outputs)
+            else:
+                self._write_csv(outputs)
+        finally:
+            self._spool.cleanup()
+
+    def _columns(self, outputs: list[np.ndarray], start: int, stop: int) -> dict[str, np.ndarray]:
+        columns = {'dates': self.data.dates.to_numpy()[start:stop],
+                   'flows': self.data.flows[start:stop],
+                   'day_of_water_year': self.data.dsowy[start:stop]}
+        for names, output in zip(self.names, outputs):
+            for i, name in enumerate(names):
+                columns[name] = output[start:stop, i]
+        return columns
+
+    def _write_csv(self, outputs: list[np.ndarray]) -> None:
+        rows = len(self.data.flows)
+        for start in range(0, max(rows, 1), self.chunk_rows):
+            stop = min(start + self.chunk_rows, rows)
+            df = pd.DataFrame(self._columns(outputs, start, stop), index=range(start, stop))
+            df.to_csv(self.path, mode='w' if start == 0 else 'a', header=start == 0)
+
+    def _write_parquet(self, outputs: list[np.ndarray]) -> None:
+        import pyarrow as pa # pylint: disable=import-outside-toplevel
+        import pyarrow.parquet as pq # pylint: disable=import-outside-toplevel
+        columns = self._columns(outputs, 0, len(self.data.flows))
+        pq.write_table(pa.table({k: pa.array(v) for k, v in columns.items()}), self.path)
@@ -31,6 +31,35 @@ def day_of_water_year(dt, start: int = 274) -> int:
         start = start + 1 if start < 60 and dt.is_leap_year else start
         return dt.dayofyear + (end - start) if dt.dayofyear < start else dt.dayofyear - (start - 1)
     
+def days_of_water_year(dates, start: int = 274) -> np.ndarray:
+    '''Computes the day of water year of each date, see day_of_water_year.
+    Uses array operations rather than evaluating each date.
+
+    Parameters
+    ----------
+    dates: pandas.Series
+        The datetime dates to be evaluated.
+    start: int
+        The day of the year in which a new water year begins during non-leap years.
+
+    Returns
+    -----------
+    numpy.ndarray
+        The day in the water year for each date.
+
+    Raises
+    -----------
+    ValueError
+        if start > 365
+    '''
+    if start > 365:
+        raise ValueError('The start date is invalid.')
+    dayofyear = dates.dt.dayofyear.to_numpy()
+    is_leap_year = dates.dt.is_leap_year.to_numpy()
+    end = np.where(is_leap_year, 366, 365)
+    start = np.where((start < 60) & is_leap_year, start + 1, start)
+    return np.where(dayofyear < start, dayofyear + (end - start), dayofyear - (start - 1))
+
 def days_to_hours(days: float) -> float:
     return days * 24
 def hours_to_minutes(hours: float) -> float:
@@ -23,7 +23,9 @@ setup(
     install_requires=['numpy'
                       'pandas'
                       ],
-    extras_require={'dev': ['twine']
+    extras_require={'dev': ['twine'],
+                    'gridded': ['xarray', 'dask', 'netCDF4', 'zarr'],
+                    'arrow': ['pyarrow'],
                     },
     python_requires='>=3.12',
 )
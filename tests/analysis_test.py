@@ -0,0 +1,55 @@
+'''Test the analysis module.'''
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from functionalflows.model.data import Input
+from functionalflows.model.analysis import Analysis
+from functionalflows.model.component import Component, ScoringCriteria
+from functionalflows.model.characteristic import factory
+
+class TestAnalysis(unittest.TestCase):
+    '''Tests the Analysis class.'''
+    def setUp(self):
+        data = Input(pd.Series(pd.date_range('2000-01-01', periods=10), name='dates'),
+                     np.arange(10, dtype=float))
+        self.components = [
+            Component('high', {'magnitude': factory('magnitude', [1, 4.5, '>'])}, ScoringCriteria([1])),
+            Component('low', {'magnitude': factory('magnitude', [1, 2.5, '<'])}, ScoringCriteria([1]))]
+        self.analysis = Analysis(data, self.components)
+
+    def test_iter_run(self):
+        '''Test iter_run yields each component output, in order, as it is evaluated.'''
+        outputs = self.analysis.iter_run()
+        first = next(outputs)
+        self.assertEqual(first.component_name, 'high')
+        np.testing.assert_array_equal(first.data[:, 0], np.arange(10) > 4.5)
+        self.assertEqual([output.component_name for output in outputs], ['low'])
+
+    def test_run_writes_csv_without_extension(self):
+        '''Test outputs are written as csv for paths that are not .parquet.'''
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'results')
+            self.analysis.run(path)
+            df = pd.read_csv(path, index_col=0)
+            self.assertEqual(list(df.columns[-2:]), ['low_magnitude', 'low_success'])
+
+    def test_run_cleans_up_on_error(self):
+        '''Test the spooled outputs are removed if a component fails.'''
+        def fail(data, outputs=None, order=None):
+            raise RuntimeError('failed')
+        self.analysis.components.append(Component('fail', {'fail': fail}, ScoringCriteria([1])))
+        with tempfile.TemporaryDirectory() as tmp:
+            with self.assertRaises(RuntimeError):
+                self.analysis.run(os.path.join(tmp, 'output.csv'))
+            self.assertEqual(os.listdir(tmp), [])
+
+    def test_run_rejects_duplicate_columns(self):
+        '''Test components with the same output column names are not overwritten.'''
+        self.analysis.components.append(self.components[0])
+        with tempfile.TemporaryDirectory() as tmp:
+            with self.assertRaises(ValueError):
+                self.analysis.run(os.path.join(tmp, 'output.csv'))
@@ -0,0 +1,81 @@
+'''Test the input cache.'''
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from functionalflows.model.data import Input
+from functionalflows.model.cache import InputCache
+
+class TestInputCache(unittest.TestCase):
+    '''Tests the InputCache class.'''
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory() # pylint: disable=consider-using-with
+        self.path = os.path.join(self.tmp.name, 'input.csv')
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write('dates,flows\n1997-01-01 07:30:00,1.5\n1997-01-02 07:30:00,2.5\n')
+        self.cache = InputCache(directory=os.path.join(self.tmp.name, 'cache'))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_warm_load_matches_parse(self):
+        '''Test the cached input matches the parsed input.'''
+        cold = Input.from_csv(self.path, 274, self.cache)
+        warm = Input.from_csv(self.path, 274, self.cache)
+        self.assertIsInstance(warm.flows, np.memmap)
+        np.testing.assert_array_equal(cold.flows, warm.flows)
+        np.testing.assert_array_equal(cold.dsowy, warm.dsowy)
+        np.testing.assert_array_equal(cold.dates.to_numpy(), warm.dates.to_numpy())
+
+    def test_key_depends_on_start_of_water_year(self):
+        '''Test inputs with different water years are cached separately.'''
+        self.assertNotEqual(self.cache.key(self.path, 274), self.cache.key(self.path, 121))
+
+    def test_evict(self):
+        '''Test entries beyond max_bytes are evicted.'''
+        Input.from_csv(self.path, 274, self.cache)
+        self.cache.max_bytes = 0
+        self.cache.evict()
+        self.assertIsNone(self.cache.load(self.path, 274))
+
+    def test_foreign_files_are_kept(self):
+        '''Test evict and clear only remove cache entries.'''
+        foreign = os.path.join(self.cache.directory, 'my_project_data')
+        os.makedirs(foreign)
+        with open(os.path.join(foreign, 'data.csv'), 'w', encoding='utf-8') as f:
+            f.write('x' * 2000)
+        self.cache.max_bytes = 0
+        Input.from_csv(self.path, 274, self.cache)
+        self.cache.clear()
+        self.assertTrue(os.path.exists(os.path.join(foreign, 'data.csv')))
+        self.assertEqual(self.cache.entries(), [])
+
+    def test_timezone_aware_dates(self):
+        '''Test timezone aware dates are the same on cold and warm loads.'''
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write('dates,flows\n2000-01-01 00:00+05:00,1.5\n2000-01-02 00:00+05:00,2.5\n')
+        cold = Input.from_csv(self.path, 274, self.cache)
+        warm = Input.from_csv(self.path, 274, self.cache)
+        self.assertIsInstance(warm.flows, np.memmap)
+        pd.testing.assert_series_equal(cold.dates, warm.dates)
+        np.testing.assert_array_equal(cold.dsowy, warm.dsowy)
+
+    def test_store_failures_are_ignored(self):
+        '''Test the input is returned when the cache cannot be written.'''
+        blocked = os.path.join(self.tmp.name, 'blocked')
+        with open(blocked, 'w', encoding='utf-8') as f:
+            f.write('not a directory')
+        data = Input.from_csv(self.path, 274, InputCache(directory=blocked))
+        np.testing.assert_array_equal(data.flows, [1.5, 2.5])
+
+    def test_existing_entry_is_kept(self):
+        '''Test a store racing another writer keeps its entry and removes the temporary files.'''
+        Input.from_csv(self.path, 274, self.cache)
+        entry = os.path.join(self.cache.directory, self.cache.key(self.path, 274))
+        created = os.stat(os.path.join(entry, 'flows.npy')).st_ino
+        self.cache.store(self.path, 274, np.zeros(2, dtype='datetime64[ns]'), np.zeros(2), np.zeros(2))
+        self.assertEqual(os.stat(os.path.join(entry, 'flows.npy')).st_ino, created)
+        self.assertEqual(os.listdir(self.cache.directory), [os.path.basename(entry)])
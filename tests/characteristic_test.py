@@ -2,10 +2,24 @@
 import unittest
 import operator
 
+import numpy as np
+import pandas as pd
+
 from src.characteristic import match_symbol
+from functionalflows.model.data import Input
+from functionalflows.model.characteristic import factory
 
 class TestMatchSymbol(unittest.TestCase):
     '''Tests the match_symbol function.'''
     def test_match_symbol(self):
         '''Test the match_symbol function.'''
         self.assertEqual(match_symbol('>'), operator.gt)
+
+class TestDuration(unittest.TestCase):
+    '''Tests the duration characteristic.'''
+    def test_any_run(self):
+        '''Test a duration of 0 periods marks any complete run of the pattern.'''
+        data = Input(pd.Series(pd.date_range('2000-01-01', periods=5), name='dates'), np.ones(5))
+        outputs = np.array([[1, 0, 0], [1, 0, 0], [0, 0, 0], [1, 0, 0], [0, 1, 0]], dtype=np.int32)
+        np.testing.assert_array_equal(factory('duration', [0, [1, 0], '>'])(data, outputs),
+                                      [1, 1, 0, 1, 0])
@@ -0,0 +1,74 @@
+'''Test the data module.'''
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from functionalflows.model.data import Input, Output
+from functionalflows.utilities import day_of_water_year
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+class TestInput(unittest.TestCase):
+    '''Tests the Input class.'''
+    def setUp(self):
+        # two days of 6 hourly flows.
+        self.data = Input(pd.Series(pd.date_range('2000-10-01', periods=8, freq='6h'), name='dates'),
+                          np.arange(8, dtype=float))
+
+    def test_resample(self):
+        '''Test the sub-daily flows are aggregated to daily flows.'''
+        daily = self.data.resample('1D', 'mean')
+        np.testing.assert_array_equal(daily.flows, [1.5, 5.5])
+        np.testing.assert_array_equal(self.data.resample('1D', 'max').flows, [3, 7])
+        np.testing.assert_array_equal(daily.dsowy, Input(daily.dates, daily.flows).dsowy)
+
+    def test_periods(self):
+        '''Test durations are converted to periods at the input timestep.'''
+        self.assertEqual(self.data.periods('1D'), 4)
+        self.assertEqual(self.data.periods(3), 3)
+        with self.assertRaises(ValueError):
+            self.data.periods(0)
+
+    def test_resample_timezone_aware(self):
+        '''Test timezone aware flows are aggregated by local day.'''
+        dates = self.data.dates.dt.tz_localize('America/Los_Angeles')
+        daily = Input(dates, self.data.flows).resample('1D', 'mean')
+        np.testing.assert_array_equal(daily.flows, [1.5, 5.5])
+        self.assertEqual(list(daily.dates), list(pd.date_range('2000-10-01', periods=2,
+                                                               tz='America/Los_Angeles')))
+        np.testing.assert_array_equal(daily.dsowy, Input(daily.dates, daily.flows).dsowy)
+
+    def test_resample_unsorted(self):
+        '''Test unsorted dates are not resampled.'''
+        data = Input(self.data.dates[::-1].reset_index(drop=True), self.data.flows)
+        with self.assertRaises(ValueError):
+            data.resample('1D')
+
+    def test_dsowy(self):
+        '''Test the days of water year match day_of_water_year for each date.'''
+        dates = pd.Series(pd.date_range('1999-01-01', '2001-12-31'), name='dates')
+        for start in (1, 60, 121, 274, 365):
+            expected = [day_of_water_year(date, start) for date in dates]
+            np.testing.assert_array_equal(Input(dates, np.zeros(len(dates)), start).dsowy, expected)
+
+class TestOutput(unittest.TestCase):
+    '''Tests the Output class.'''
+    def setUp(self):
+        self.output = Output('c', ['a', 'success'], np.asfortranarray(np.eye(5, 2, dtype=np.int32)))
+
+    def test_to_df_is_a_view(self):
+        '''Test the dataframe shares the output data.'''
+        self.assertTrue(np.shares_memory(self.output.to_df().to_numpy(), self.output.data))
+
+    @unittest.skipUnless(pyarrow, 'requires pyarrow')
+    def test_to_arrow_is_zero_copy(self):
+        '''Test each arrow column buffer is the output data column.'''
+        batch = self.output.to_arrow()
+        self.assertEqual(batch.schema.names, ['c_a', 'c_success'])
+        for i in range(self.output.data.shape[1]):
+            self.assertEqual(batch.column(i).buffers()[1].address,
+                             self.output.data[:, i].__array_interface__['data'][0])
@@ -0,0 +1,66 @@
+'''Test the gridded module.'''
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from functionalflows.model.data import Input
+from functionalflows.model.gridded import GriddedAnalysis, evaluate_block
+from functionalflows.model.component import Component, ScoringCriteria
+from functionalflows.model.characteristic import factory
+
+try:
+    import xarray as xr
+except ImportError:
+    xr = None
+
+def components() -> list[Component]:
+    '''Components using each kind of characteristic input.'''
+    return [
+        Component('baseflow', {'timing': factory('timing', [200, 366]),
+                               'magnitude': factory('magnitude', [3, 1.0, '>']),
+                               'duration': factory('duration', [2, [1, 0], '>'])},
+                  ScoringCriteria([1, 0, 1], False)),
+        Component('bankfull', {'magnitude': factory('magnitude', [1, 2.0, '>']),
+                               'frequency': factory('frequency', [1, 1, [1], '>'])},
+                  ScoringCriteria(['*', 1]))]
+
+class TestGridded(unittest.TestCase):
+    '''Tests gridded evaluation matches evaluation of each reach.'''
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.dates = pd.Series(pd.date_range('2000-01-01', periods=800), name='dates')
+        self.flows = rng.gamma(1, 1, size=(800, 3))
+        self.components = components()
+
+    def expected(self, j: int) -> np.ndarray:
+        data = Input(self.dates, self.flows[:, j], 121)
+        return np.concatenate([component.evaluate(data).data for component in self.components], axis=1)
+
+    def test_evaluate_block(self):
+        '''Test each reach of a block matches Component.evaluate for that reach.'''
+        template = Input(self.dates, np.zeros(len(self.dates)), 121)
+        out = evaluate_block(self.flows, template, self.components)
+        for j in range(self.flows.shape[1]):
+            np.testing.assert_array_equal(out[:, j, :], self.expected(j))
+
+    @unittest.skipUnless(xr, 'requires xarray and dask')
+    def test_round_trip(self):
+        '''Test NetCDF input to NetCDF and Zarr outputs matches Component.evaluate for each reach.'''
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'flows.nc')
+            xr.Dataset({'flows': (('time', 'reach'), self.flows)},
+                       coords={'time': self.dates.to_numpy(), 'reach': np.arange(3)}).to_netcdf(path)
+            for output_path in (os.path.join(tmp, 'outputs.nc'), os.path.join(tmp, 'outputs.zarr')):
+                GriddedAnalysis(path, self.components, 121, reach_chunks=2,
+                                scheduler='synchronous').run(output_path)
+                with xr.open_dataset(output_path, engine='zarr' if output_path.endswith('.zarr') else None) as ds:
+                    for j in range(3):
+                        names = [f'{c.name}_{n}' for c in self.components for n in c.output_names()]
+                        actual = np.stack([ds[name].isel(reach=j).to_numpy() for name in names], axis=1)
+                        np.testing.assert_array_equal(actual, self.expected(j))
+            data = Input.from_netcdf(path, reach=1, start_of_water_year=121)
+            np.testing.assert_array_equal(data.flows, self.flows[:, 1])
+            np.testing.assert_array_equal(data.dsowy, Input(self.dates, self.flows[:, 1], 121).dsowy)
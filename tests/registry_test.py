@@ -0,0 +1,116 @@
+'''Test the characteristic registry.'''
+import os
+import tempfile
+import unittest
+from unittest import mock
+from importlib.metadata import EntryPoint
+
+import numpy as np
+import pandas as pd
+
+from functionalflows.config import build_components, read_config_file
+from functionalflows.model.data import Input
+from functionalflows.model.component import Component, ScoringCriteria
+from functionalflows.model.characteristic import (REGISTRY, ENTRY_POINT_GROUP,
+                                                  Characteristic, factory, register)
+
+def constant(value: int = 1):
+    '''Closure for a characteristic with a constant value, loaded by path in the tests.'''
+    # pylint: disable=unused-argument
+    def evaluate(data, outputs=None, order=None):
+        return np.full(len(data.flows), value, dtype=np.int64)
+    return evaluate
+
+class TestRegistry(unittest.TestCase):
+    '''Tests registering and creating characteristics.'''
+    def setUp(self):
+        self.data = Input(pd.Series(pd.date_range('2000-01-01', periods=5), name='dates'),
+                          np.arange(5, dtype=float))
+
+    def tearDown(self):
+        REGISTRY.pop('constant', None)
+
+    def test_register(self):
+        '''Test a registered characteristic is created by the factory.'''
+        register('constant')(constant)
+        np.testing.assert_array_equal(factory('constant', [0])(self.data), np.zeros(5))
+
+    def test_strict(self):
+        '''Test characteristics that are not vectorized are rejected in strict mode.'''
+        register('constant')(constant)
+        with self.assertRaises(ValueError):
+            factory('constant', [], strict=True)
+        factory('magnitude', [1, 0, '>'], strict=True)
+
+    def test_contract(self):
+        '''Test unknown inputs, missing windows and non integer dtypes are rejected.'''
+        for kwargs in ({'inputs': ('temperature',)}, {'inputs': ('rolling_mean',)},
+                       {'inputs': ('flows:7',)}, {'dtype': 'float64'}):
+            with self.assertRaises(ValueError):
+                Characteristic('bad', constant, **kwargs)
+
+    def test_inputs_are_resolved(self):
+        '''Test declared inputs naming a parameter are resolved from the parameters.'''
+        self.assertEqual(factory('magnitude', [7, 1.0, '>']).inputs, (('rolling_mean', 7),))
+        self.assertEqual(factory('magnitude', []).inputs, (('rolling_mean', 1),))
+        register('constant', inputs=('rolling_mean:3', 'water_years'))(constant)
+        self.assertEqual(factory('constant', [1]).inputs, (('rolling_mean', 3), ('water_years', None)))
+
+    def test_declared_inputs_are_prepared(self):
+        '''Test declared inputs are computed once, before evaluation, and shared.'''
+        register('constant', inputs=('rolling_mean:3',))(constant)
+        component = Component('c', {'constant': factory('constant', [1])}, ScoringCriteria([1]))
+        component.evaluate(self.data)
+        # constant does not use the moving average, so it was prepared from the declaration.
+        prepared = self.data._rolling_means # pylint: disable=protected-access
+        self.assertEqual(list(prepared), [3])
+        np.testing.assert_array_equal(prepared[3], [0, 0.5, 1, 2, 3])
+        self.assertIs(self.data.rolling_mean(3), prepared[3])
+
+    def test_dtype_is_honored(self):
+        '''Test outputs are allocated with the declared dtype.'''
+        register('constant', dtype='int64')(constant)
+        component = Component('c', {'constant': factory('constant', [2**40])}, ScoringCriteria(['*']))
+        output = component.evaluate(self.data)
+        self.assertEqual(output.data.dtype, np.int64)
+        np.testing.assert_array_equal(output.data[:, 0], np.full(5, 2**40))
+
+    def test_entry_point(self):
+        '''Test unregistered characteristics are loaded from entry points.'''
+        entry_point = EntryPoint('constant', 'tests.registry_test:constant', ENTRY_POINT_GROUP)
+        with mock.patch('functionalflows.model.characteristic.entry_points',
+                        return_value=[entry_point]) as found:
+            np.testing.assert_array_equal(factory('constant', [3])(self.data), np.full(5, 3))
+        found.assert_called_once_with(group=ENTRY_POINT_GROUP, name='constant')
+        self.assertFalse(REGISTRY['constant'].vectorized)
+
+    def test_config(self):
+        '''Test characteristics are registered from the [characteristics] table.'''
+        config = '\n'.join([
+            'first_day_of_water_year = 274',
+            'strict = true',
+            '[characteristics.constant]',
+            'function = "tests.registry_test:constant"',
+            'inputs = ["rolling_mean:value"]',
+            'dtype = "int64"',
+            'vectorized = true',
+            '[components.c]',
+            'characteristics = ["constant"]',
+            'parameters = [[2]]',
+            'scoring_pattern = [2]',
+            'success_pattern = true'])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'config.toml')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(config)
+            with mock.patch('builtins.print'):
+                components = build_components(read_config_file(path))
+        self.assertEqual(REGISTRY['constant'].dtype, 'int64')
+        self.assertEqual(components[0].inputs(), [('rolling_mean', 2)])
+        output = components[0].evaluate(self.data)
+        np.testing.assert_array_equal(output.data, np.full((5, 2), [2, 1]))
+
+    def test_not_implemented(self):
+        '''Test unknown characteristics raise NotImplementedError.'''
+        with self.assertRaises(NotImplementedError):
+            factory('unknown', [])
@@ -0,0 +1,39 @@
+'''Test the output writer.'''
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from functionalflows.model.data import Input, Output
+from functionalflows.model.writer import OutputWriter
+
+class TestOutputWriter(unittest.TestCase):
+    '''Tests the OutputWriter class.'''
+    def test_chunked_csv_matches_dataframe(self):
+        '''Test the csv written in chunks matches the joined input and output dataframes.'''
+        data = Input(pd.Series(pd.date_range('2000-01-01', periods=5), name='dates'),
+                     np.arange(5, dtype=float))
+        output = Output('c', ['a', 'success'], np.asfortranarray(np.eye(5, 2, dtype=np.int32)))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'output.csv')
+            with OutputWriter(path, data, chunk_rows=2) as writer:
+                writer.write(output)
+            expected = data.to_df(reset_index=True).join(output.to_df())
+            pd.testing.assert_frame_equal(pd.read_csv(path, index_col=0, parse_dates=['dates']),
+                                          expected, check_dtype=False)
+
+    def test_spool_is_next_to_output(self):
+        '''Test the columns are spooled in the output directory, and removed on close.'''
+        data = Input(pd.Series(pd.date_range('2000-01-01', periods=5), name='dates'),
+                     np.arange(5, dtype=float))
+        output = Output('c', ['a', 'success'], np.asfortranarray(np.eye(5, 2, dtype=np.int32)))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'output.csv')
+            with OutputWriter(path, data) as writer:
+                writer.write(output)
+                spooled = [name for name in os.listdir(tmp) if name != 'output.csv']
+                self.assertEqual(len(spooled), 1)
+                self.assertEqual(os.listdir(os.path.join(tmp, spooled[0])), ['0.npy'])
+            self.assertEqual(os.listdir(tmp), ['output.csv'])